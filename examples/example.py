@@ -54,9 +54,9 @@ def main():
         print("\n" + "=" * 60)
         print("Token examples:")
         sample_tokens = ["the", "hello", "<pad>", "a"]
-        for token in sample_tokens:
-            if editor.has_token(token):
-                token_id = editor.get_token_id(token)
+        token_ids = editor.get_ids(sample_tokens)
+        for token, token_id in zip(sample_tokens, token_ids):
+            if token_id is not None:
                 print(f"  '{token}' -> ID {token_id}")
             else:
                 print(f"  '{token}' -> NOT IN VOCAB")
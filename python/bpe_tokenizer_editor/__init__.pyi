@@ -1,6 +1,6 @@
 """Type stubs for bpe_tokenizer_editor."""
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 __version__: str
 
@@ -21,6 +21,14 @@ class ValidationResult:
     def invalid_merges(self) -> List[Tuple[int, str, str]]:
         """List of (index, token_a, token_b) for invalid merges."""
         ...
+    
+    @property
+    def boundary_invalid_merges(self) -> List[Tuple[int, str, str]]:
+        """List of (index, token_a, token_b) for merges BPE encoding never applies.
+        
+        Only filled by validate_merges(check_reachability=True).
+        """
+        ...
 
 class AdditionResult:
     """Result of token addition operation."""
@@ -204,12 +212,15 @@ class BPETokenizerEditor:
         >>> editor.save("tokenizer_modified.json")
     """
     
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, use_cache: bool = False) -> None:
         """
         Load a tokenizer from a JSON file.
         
         Args:
             path: Path to the tokenizer.json file
+            use_cache: Reuse (and maintain) a binary ``<path>.bpecache``
+                sidecar for faster reloads. The cache is keyed on the JSON
+                file's size and modification time and rebuilt when they change.
             
         Raises:
             IOError: If the file cannot be read
@@ -218,12 +229,15 @@ class BPETokenizerEditor:
         ...
     
     @staticmethod
-    def from_json(json_str: str) -> "BPETokenizerEditor":
+    def from_json(json_str: Union[str, bytes]) -> "BPETokenizerEditor":
         """
         Create a new editor from JSON string.
         
+        Passing the raw bytes of a file or response avoids decoding
+        them to str first.
+        
         Args:
-            json_str: JSON string containing the tokenizer
+            json_str: JSON containing the tokenizer, as str or UTF-8 bytes
             
         Returns:
             BPETokenizerEditor instance
@@ -247,7 +261,7 @@ class BPETokenizerEditor:
     
     def to_json(self) -> str:
         """
-        Export tokenizer to JSON string.
+        Export tokenizer to JSON string (vocab sorted by ID ascending).
         
         Returns:
             JSON string representation of the tokenizer
@@ -288,6 +302,34 @@ class BPETokenizerEditor:
         """
         ...
     
+    def contains_many(self, tokens: List[str]) -> List[bool]:
+        """
+        Check which of several tokens exist in the vocabulary.
+        
+        Faster than calling has_token in a loop for large batches.
+        
+        Args:
+            tokens: List of token strings to check
+            
+        Returns:
+            List of bools, one per input token
+        """
+        ...
+    
+    def get_ids(self, tokens: List[str]) -> List[Optional[int]]:
+        """
+        Get the IDs of several tokens.
+        
+        Faster than calling get_token_id in a loop for large batches.
+        
+        Args:
+            tokens: List of token strings
+            
+        Returns:
+            List of token IDs, None for tokens not in the vocabulary
+        """
+        ...
+    
     def get_token_by_id(self, id: int) -> Optional[str]:
         """
         Get a token by its ID.
@@ -318,6 +360,33 @@ class BPETokenizerEditor:
         """
         ...
     
+    def get_vocab_ids(self) -> Tuple[bytes, List[str]]:
+        """
+        Get the vocabulary as parallel columns ordered by token ID.
+        
+        Cheaper than get_vocab() on large vocabularies: the IDs come back as
+        one contiguous buffer of native-endian u32 values instead of a Python
+        int per entry. View it with array.array('I', ids) or
+        numpy.frombuffer(ids, dtype=numpy.uint32).
+        
+        Returns:
+            Tuple of (ids, tokens) where ids is bytes and tokens[i] has the
+            i-th ID in ids
+        """
+        ...
+    
+    def get_merges_columns(self) -> Tuple[List[str], List[str]]:
+        """
+        Get all merges as two parallel lists.
+        
+        Cheaper than get_merges() on large tokenizers since no per-merge
+        tuple is built.
+        
+        Returns:
+            Tuple of (lefts, rights) where merge i is (lefts[i], rights[i])
+        """
+        ...
+    
     def get_stats(self) -> TokenizerStats:
         """
         Get comprehensive tokenizer statistics.
@@ -327,10 +396,16 @@ class BPETokenizerEditor:
         """
         ...
     
-    def validate_merges(self) -> ValidationResult:
+    def validate_merges(self, check_reachability: bool = False) -> ValidationResult:
         """
         Validate all merges - check that each merge result exists in vocabulary.
         
+        Args:
+            check_reachability: Also report merges that BPE encoding can never
+                apply because an earlier merge across the boundary of their
+                inputs fires first (boundary_invalid_merges). This re-encodes
+                every merge and is several times slower than the basic check.
+        
         Returns:
             ValidationResult with valid/invalid merge counts and details
         """
@@ -366,6 +441,10 @@ class BPETokenizerEditor:
         """
         Add multiple tokens.
         
+        The GIL is released while the batch runs. Other Python threads keep
+        running, but any call on this same editor from them raises RuntimeError
+        (already borrowed) until the batch returns, instead of waiting.
+        
         Args:
             tokens: List of token strings to add
             
@@ -407,6 +486,10 @@ class BPETokenizerEditor:
         """
         Remove multiple tokens.
         
+        The GIL is released while the batch runs. Other Python threads keep
+        running, but any call on this same editor from them raises RuntimeError
+        (already borrowed) until the batch returns, instead of waiting.
+        
         Args:
             tokens: List of token strings to remove
             
@@ -438,6 +521,10 @@ class BPETokenizerEditor:
         """
         Find tokens that would be removed by shrink operation (preview).
         
+        The GIL is released during the scan. Other threads may read this
+        editor meanwhile, but a modifying call on it raises RuntimeError
+        (already borrowed) until the scan returns.
+        
         Args:
             count: Number of tokens to find
             min_id: Only consider tokens with ID >= min_id (default: 0)
@@ -0,0 +1,342 @@
+//! Binary sidecar cache (`tokenizer.json.bpecache`) for fast reloads
+//!
+//! The cache stores the vocab and merges as length-prefixed strings, which load with
+//! plain copies instead of JSON string scanning and unescaping. The remaining
+//! tokenizer fields are small and are kept as embedded JSON. A cache is only used
+//! when the size and modification time recorded in it match the JSON file, so
+//! editing or re-saving the JSON invalidates it.
+//!
+//! Layout (integers little-endian):
+//!
+//! ```text
+//! magic "BPEC" | format u32 | json len u64 | json mtime secs u64, nanos u32
+//! skeleton len u64 | skeleton JSON (tokenizer with empty vocab/merges)
+//! vocab count u64 | (id u32 | len u32 | token bytes)*
+//! merges count u64 | (len u32 | left bytes | len u32 | right bytes)*
+//! ```
+
+use anyhow::{Context, Result};
+use memmap2::Mmap;
+use std::collections::BTreeMap;
+use std::fs::{self, File, OpenOptions};
+use std::io::{BufWriter, Write};
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::time::UNIX_EPOCH;
+
+use crate::tokenizer::{Merge, Model, Tokenizer};
+
+const MAGIC: &[u8; 4] = b"BPEC";
+const FORMAT_VERSION: u32 = 1;
+
+/// Makes temp file names unique across threads of this process
+static TMP_COUNTER: AtomicU64 = AtomicU64::new(0);
+
+/// Size and modification time of the JSON file a cache was built from
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct Fingerprint {
+    len: u64,
+    mtime_secs: u64,
+    mtime_nanos: u32,
+}
+
+impl Fingerprint {
+    /// Stat `path`; `None` if the file or its mtime is unavailable
+    pub fn of(path: &Path) -> Option<Self> {
+        let meta = fs::metadata(path).ok()?;
+        let mtime = meta.modified().ok()?.duration_since(UNIX_EPOCH).ok()?;
+        Some(Self {
+            len: meta.len(),
+            mtime_secs: mtime.as_secs(),
+            mtime_nanos: mtime.subsec_nanos(),
+        })
+    }
+}
+
+/// Path of the sidecar cache for a tokenizer.json
+pub fn cache_path(json_path: &Path) -> PathBuf {
+    let mut name = json_path.as_os_str().to_owned();
+    name.push(".bpecache");
+    PathBuf::from(name)
+}
+
+/// Read the cache for `json_path` if it exists and is up to date
+///
+/// Any problem (missing, stale, truncated or foreign file) yields `None` so the
+/// caller can fall back to parsing the JSON.
+pub fn read(json_path: &Path) -> Option<Tokenizer> {
+    let fingerprint = Fingerprint::of(json_path)?;
+    let file = File::open(cache_path(json_path)).ok()?;
+    // SAFETY: the mapping is read-only and only lives for the duration of the decode.
+    // Caches are replaced by rename, never rewritten in place.
+    let data = unsafe { Mmap::map(&file) }.ok()?;
+    decode(&data, fingerprint)
+}
+
+/// Write the cache for `json_path`, built from the file state in `fingerprint`
+///
+/// The file is written under a temporary name unique to this call and renamed
+/// into place, so readers never see a partial cache, even with several threads
+/// or processes writing the same cache at once.
+pub fn write(json_path: &Path, fingerprint: Fingerprint, tokenizer: &Tokenizer) -> Result<()> {
+    let path = cache_path(json_path);
+    let mut tmp_name = path.as_os_str().to_owned();
+    tmp_name.push(format!(
+        ".{}.{}.tmp",
+        std::process::id(),
+        TMP_COUNTER.fetch_add(1, Ordering::Relaxed)
+    ));
+    let tmp_path = PathBuf::from(tmp_name);
+
+    // create_new: never share a temp file with another writer
+    let file = OpenOptions::new()
+        .write(true)
+        .create_new(true)
+        .open(&tmp_path)
+        .with_context(|| format!("Failed to write cache: {:?}", path))?;
+
+    let result = write_file(file, fingerprint, tokenizer)
+        .and_then(|_| fs::rename(&tmp_path, &path).with_context(|| "Failed to move cache"));
+    if result.is_err() {
+        let _ = fs::remove_file(&tmp_path);
+    }
+    result.with_context(|| format!("Failed to write cache: {:?}", path))
+}
+
+fn write_file(file: File, fingerprint: Fingerprint, tokenizer: &Tokenizer) -> Result<()> {
+    let mut w = BufWriter::with_capacity(1 << 20, file);
+    let model = &tokenizer.model;
+
+    w.write_all(MAGIC)?;
+    w.write_all(&FORMAT_VERSION.to_le_bytes())?;
+    w.write_all(&fingerprint.len.to_le_bytes())?;
+    w.write_all(&fingerprint.mtime_secs.to_le_bytes())?;
+    w.write_all(&fingerprint.mtime_nanos.to_le_bytes())?;
+
+    let skeleton = serde_json::to_vec(&skeleton(tokenizer))?;
+    w.write_all(&(skeleton.len() as u64).to_le_bytes())?;
+    w.write_all(&skeleton)?;
+
+    w.write_all(&(model.vocab.len() as u64).to_le_bytes())?;
+    for (token, &id) in &model.vocab {
+        w.write_all(&id.to_le_bytes())?;
+        write_str(&mut w, token)?;
+    }
+
+    w.write_all(&(model.merges.len() as u64).to_le_bytes())?;
+    for merge in &model.merges {
+        write_str(&mut w, &merge.0)?;
+        write_str(&mut w, &merge.1)?;
+    }
+
+    w.flush()?;
+    Ok(())
+}
+
+fn write_str<W: Write>(w: &mut W, s: &str) -> Result<()> {
+    let len = u32::try_from(s.len()).with_context(|| "Token too long for cache")?;
+    w.write_all(&len.to_le_bytes())?;
+    w.write_all(s.as_bytes())?;
+    Ok(())
+}
+
+/// Copy of the tokenizer without its vocab and merges
+fn skeleton(tokenizer: &Tokenizer) -> Tokenizer {
+    let model = &tokenizer.model;
+    Tokenizer {
+        version: tokenizer.version.clone(),
+        truncation: tokenizer.truncation.clone(),
+        padding: tokenizer.padding.clone(),
+        added_tokens: tokenizer.added_tokens.clone(),
+        normalizer: tokenizer.normalizer.clone(),
+        pre_tokenizer: tokenizer.pre_tokenizer.clone(),
+        post_processor: tokenizer.post_processor.clone(),
+        decoder: tokenizer.decoder.clone(),
+        model: Model {
+            model_type: model.model_type.clone(),
+            dropout: model.dropout,
+            unk_token: model.unk_token.clone(),
+            continuing_subword_prefix: model.continuing_subword_prefix.clone(),
+            end_of_word_suffix: model.end_of_word_suffix.clone(),
+            fuse_unk: model.fuse_unk,
+            byte_fallback: model.byte_fallback,
+            ignore_merges: model.ignore_merges,
+            vocab: BTreeMap::new(),
+            merges: Vec::new(),
+        },
+    }
+}
+
+fn decode(data: &[u8], expected: Fingerprint) -> Option<Tokenizer> {
+    let mut r = Reader { data, pos: 0 };
+
+    if r.bytes(4)? != MAGIC || r.u32()? != FORMAT_VERSION {
+        return None;
+    }
+    let fingerprint = Fingerprint {
+        len: r.u64()?,
+        mtime_secs: r.u64()?,
+        mtime_nanos: r.u32()?,
+    };
+    if fingerprint != expected {
+        return None;
+    }
+
+    let skeleton_len = r.len()?;
+    let mut tokenizer: Tokenizer = serde_json::from_slice(r.bytes(skeleton_len)?).ok()?;
+
+    // Entries were written in key order, which lets the map bulk-build
+    let vocab_count = r.len()?;
+    let mut vocab = Vec::with_capacity(vocab_count.min(data.len() / 8));
+    for _ in 0..vocab_count {
+        let id = r.u32()?;
+        vocab.push((r.string()?, id));
+    }
+    tokenizer.model.vocab = vocab.into_iter().collect();
+
+    let merges_count = r.len()?;
+    let mut merges = Vec::with_capacity(merges_count.min(data.len() / 8));
+    for _ in 0..merges_count {
+        merges.push(Merge(r.string()?, r.string()?));
+    }
+    tokenizer.model.merges = merges;
+
+    (r.pos == data.len()).then_some(tokenizer)
+}
+
+/// Bounds-checked little-endian cursor
+struct Reader<'a> {
+    data: &'a [u8],
+    pos: usize,
+}
+
+impl<'a> Reader<'a> {
+    fn bytes(&mut self, n: usize) -> Option<&'a [u8]> {
+        let end = self.pos.checked_add(n)?;
+        let out = self.data.get(self.pos..end)?;
+        self.pos = end;
+        Some(out)
+    }
+
+    fn u32(&mut self) -> Option<u32> {
+        Some(u32::from_le_bytes(self.bytes(4)?.try_into().ok()?))
+    }
+
+    fn u64(&mut self) -> Option<u64> {
+        Some(u64::from_le_bytes(self.bytes(8)?.try_into().ok()?))
+    }
+
+    fn len(&mut self) -> Option<usize> {
+        usize::try_from(self.u64()?).ok()
+    }
+
+    fn string(&mut self) -> Option<String> {
+        let len = self.u32()? as usize;
+        String::from_utf8(self.bytes(len)?.to_vec()).ok()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn sample_tokenizer() -> Tokenizer {
+        serde_json::from_str(
+            r#"{
+                "version": "1.0", "truncation": null, "padding": null,
+                "added_tokens": [{"id": 0, "content": "<pad>"}],
+                "normalizer": null, "pre_tokenizer": null, "post_processor": null,
+                "decoder": null,
+                "model": {
+                    "type": "BPE", "dropout": null, "unk_token": "<unk>",
+                    "continuing_subword_prefix": null, "end_of_word_suffix": null,
+                    "fuse_unk": false, "byte_fallback": false, "ignore_merges": false,
+                    "vocab": {"<pad>": 0, "a": 1, "ü": 2, "aü": 3},
+                    "merges": [["a", "ü"]]
+                }
+            }"#,
+        )
+        .unwrap()
+    }
+
+    fn temp_json(name: &str) -> PathBuf {
+        let path = std::env::temp_dir().join(format!(
+            "bpe-cache-test-{}-{}.json",
+            std::process::id(),
+            name
+        ));
+        let tokenizer = sample_tokenizer();
+        fs::write(&path, serde_json::to_string(&tokenizer).unwrap()).unwrap();
+        path
+    }
+
+    #[test]
+    fn test_round_trip() {
+        let path = temp_json("round-trip");
+        let tokenizer = sample_tokenizer();
+
+        assert!(read(&path).is_none());
+        write(&path, Fingerprint::of(&path).unwrap(), &tokenizer).unwrap();
+
+        let cached = read(&path).expect("cache should be valid");
+        assert_eq!(
+            serde_json::to_string(&cached).unwrap(),
+            serde_json::to_string(&tokenizer).unwrap()
+        );
+
+        fs::remove_file(cache_path(&path)).unwrap();
+        fs::remove_file(&path).unwrap();
+    }
+
+    #[test]
+    fn test_stale_and_corrupt_caches_are_ignored() {
+        let path = temp_json("stale");
+        let tokenizer = sample_tokenizer();
+        let mut fingerprint = Fingerprint::of(&path).unwrap();
+        fingerprint.len += 1;
+        write(&path, fingerprint, &tokenizer).unwrap();
+        assert!(read(&path).is_none());
+
+        write(&path, Fingerprint::of(&path).unwrap(), &tokenizer).unwrap();
+        let cache = cache_path(&path);
+        let data = fs::read(&cache).unwrap();
+        fs::write(&cache, &data[..data.len() - 1]).unwrap();
+        assert!(read(&path).is_none());
+
+        fs::remove_file(cache_path(&path)).unwrap();
+        fs::remove_file(&path).unwrap();
+    }
+
+    #[test]
+    fn test_concurrent_writers() {
+        let path = temp_json("concurrent");
+        let fingerprint = Fingerprint::of(&path).unwrap();
+
+        std::thread::scope(|scope| {
+            for _ in 0..8 {
+                scope.spawn(|| write(&path, fingerprint, &sample_tokenizer()).unwrap());
+            }
+        });
+        assert!(read(&path).is_some());
+
+        // No temp files are left behind
+        let dir = path.parent().unwrap();
+        let name = cache_path(&path)
+            .file_name()
+            .unwrap()
+            .to_string_lossy()
+            .into_owned();
+        let leftovers = fs::read_dir(dir)
+            .unwrap()
+            .filter_map(|e| e.ok())
+            .filter(|e| {
+                let n = e.file_name().to_string_lossy().into_owned();
+                n.starts_with(&name) && n.ends_with(".tmp")
+            })
+            .count();
+        assert_eq!(leftovers, 0);
+
+        fs::remove_file(cache_path(&path)).unwrap();
+        fs::remove_file(&path).unwrap();
+    }
+}
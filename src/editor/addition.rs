@@ -2,10 +2,10 @@
 
 use std::collections::HashSet;
 
-use crate::tokenizer::Merge;
 use crate::types::AdditionResult;
 
 use super::core::BPETokenizerEditor;
+use super::text::is_single_char;
 
 impl BPETokenizerEditor {
     /// Add a token atomically (no merges) - for special tokens and single chars
@@ -18,6 +18,14 @@ impl BPETokenizerEditor {
         true
     }
 
+    /// Add multiple tokens with merge chains
+    pub fn add_tokens_with_merges(&mut self, tokens: &[String]) -> Vec<AdditionResult> {
+        tokens
+            .iter()
+            .map(|t| self.add_token_with_merges(t))
+            .collect()
+    }
+
     /// Add a token with proper merge chain (longest prefix strategy)
     pub fn add_token_with_merges(&mut self, token: &str) -> AdditionResult {
         if self.has_token(token) {
@@ -29,8 +37,7 @@ impl BPETokenizerEditor {
             };
         }
 
-        let chars: Vec<char> = token.chars().collect();
-        if chars.len() == 1 {
+        if is_single_char(token) {
             self.add_token_atomic(token);
             return AdditionResult {
                 token: token.to_string(),
@@ -40,23 +47,17 @@ impl BPETokenizerEditor {
             };
         }
 
-        // Find longest prefix in vocab
-        let mut prefix: Option<String> = None;
-        for i in (1..=token.len()).rev() {
-            let p = &token[..i];
-            if self.has_token(p) {
-                prefix = Some(p.to_string());
-                break;
-            }
-        }
-
-        let added_merges = if let Some(ref pref) = prefix {
-            let suffix = &token[pref.len()..];
-            if suffix.is_empty() {
-                vec![]
-            } else {
-                self.build_suffix_and_merge(pref, suffix)
-            }
+        // Find longest proper prefix in vocab, probing char boundaries only
+        let prefix_len = token
+            .char_indices()
+            .rev()
+            .map(|(i, _)| i)
+            .take_while(|&i| i > 0)
+            .find(|&i| self.has_token(&token[..i]));
+
+        let added_merges = if let Some(len) = prefix_len {
+            let (prefix, suffix) = token.split_at(len);
+            self.build_suffix_and_merge(prefix, suffix)
         } else {
             self.build_char_chain(token)
         };
@@ -66,12 +67,10 @@ impl BPETokenizerEditor {
             self.tokenizer.model.vocab.insert(token.to_string(), id);
         }
 
-        self.rebuild_indices();
-
         AdditionResult {
             token: token.to_string(),
             added: true,
-            method: if prefix.is_some() {
+            method: if prefix_len.is_some() {
                 "longest_prefix"
             } else {
                 "char_chain"
@@ -82,50 +81,37 @@ impl BPETokenizerEditor {
     }
 
     /// Build a char chain for a token: a+b -> ab, ab+c -> abc, ...
+    ///
+    /// Every intermediate token is a prefix of `token`, so lookups work on slices and
+    /// strings are only allocated for what actually gets added.
     pub(crate) fn build_char_chain(&mut self, token: &str) -> Vec<(String, String)> {
-        let chars: Vec<char> = token.chars().collect();
-        if chars.is_empty() {
+        if token.is_empty() {
             return vec![];
         }
 
-        let mut added_merges = vec![];
-        let mut current = chars[0].to_string();
+        // Byte offsets where each char ends
+        let mut ends = token
+            .char_indices()
+            .skip(1)
+            .map(|(i, _)| i)
+            .chain(std::iter::once(token.len()));
 
-        if !self.has_token(&current) {
-            let id = self.get_next_id();
-            self.tokenizer.model.vocab.insert(current.clone(), id);
-        }
-
-        for ch in chars.iter().skip(1) {
-            let ch_str = ch.to_string();
-
-            if !self.has_token(&ch_str) {
-                let id = self.get_next_id();
-                self.tokenizer.model.vocab.insert(ch_str.clone(), id);
-            }
+        let mut added_merges = vec![];
+        let mut start = ends.next().unwrap_or(token.len());
+        self.add_token_atomic(&token[..start]);
 
-            let new_token = format!("{}{}", current, ch_str);
-            let merge_exists = self
-                .tokenizer
-                .model
-                .merges
-                .iter()
-                .any(|m| m.0 == current && m.1 == ch_str);
-
-            if !merge_exists {
-                added_merges.push((current.clone(), ch_str.clone()));
-                self.tokenizer
-                    .model
-                    .merges
-                    .push(Merge(current.clone(), ch_str.clone()));
-            }
+        for end in ends {
+            let current = &token[..start];
+            let ch = &token[start..end];
+            self.add_token_atomic(ch);
 
-            if !self.has_token(&new_token) {
-                let id = self.get_next_id();
-                self.tokenizer.model.vocab.insert(new_token.clone(), id);
+            if !self.has_merge(current, ch) {
+                added_merges.push((current.to_string(), ch.to_string()));
+                self.push_merge(current, ch);
             }
 
-            current = new_token;
+            self.add_token_atomic(&token[..end]);
+            start = end;
         }
 
         added_merges
@@ -140,19 +126,9 @@ impl BPETokenizerEditor {
             added_merges.extend(suffix_merges);
         }
 
-        let merge_exists = self
-            .tokenizer
-            .model
-            .merges
-            .iter()
-            .any(|m| m.0 == prefix && m.1 == suffix);
-
-        if !merge_exists {
+        if !self.has_merge(prefix, suffix) {
             added_merges.push((prefix.to_string(), suffix.to_string()));
-            self.tokenizer
-                .model
-                .merges
-                .push(Merge(prefix.to_string(), suffix.to_string()));
+            self.push_merge(prefix, suffix);
         }
 
         added_merges
@@ -160,19 +136,8 @@ impl BPETokenizerEditor {
 
     /// Add a merge if it doesn't exist
     pub fn add_merge_if_missing(&mut self, a: &str, b: &str) -> bool {
-        let merge_exists = self
-            .tokenizer
-            .model
-            .merges
-            .iter()
-            .any(|m| m.0 == a && m.1 == b);
-
-        if !merge_exists {
-            self.tokenizer
-                .model
-                .merges
-                .push(Merge(a.to_string(), b.to_string()));
-            self.rebuild_indices();
+        if !self.has_merge(a, b) {
+            self.push_merge(a, b);
             true
         } else {
             false
@@ -0,0 +1,59 @@
+//! BPE merge simulation over token IDs
+
+/// Apply merges to `symbols` in rank order until none applies
+///
+/// `rank_of(left, right)` returns the `(rank, merged_id)` of the merge for an
+/// adjacent pair, or `None` if the pair cannot be merged. As in BPE encoding,
+/// the lowest-ranked pair is merged first, leftmost on ties.
+pub(crate) fn byte_pair_merge<F>(symbols: &mut Vec<u32>, rank_of: F)
+where
+    F: Fn(u32, u32) -> Option<(u32, u32)>,
+{
+    loop {
+        let mut best: Option<(u32, usize, u32)> = None;
+        for i in 0..symbols.len().saturating_sub(1) {
+            if let Some((rank, merged)) = rank_of(symbols[i], symbols[i + 1]) {
+                if !matches!(best, Some((best_rank, _, _)) if best_rank <= rank) {
+                    best = Some((rank, i, merged));
+                }
+            }
+        }
+
+        match best {
+            Some((_, i, merged)) => {
+                symbols[i] = merged;
+                symbols.remove(i + 1);
+            }
+            None => break,
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    // ids: a=0 b=1 c=2 ab=3 bc=4 abc=5; merges: (b,c)=0 (a,b)=1 (ab,c)=2
+    fn rank_of(a: u32, b: u32) -> Option<(u32, u32)> {
+        match (a, b) {
+            (1, 2) => Some((0, 4)),
+            (0, 1) => Some((1, 3)),
+            (3, 2) => Some((2, 5)),
+            _ => None,
+        }
+    }
+
+    #[test]
+    fn test_lowest_rank_wins() {
+        let mut symbols = vec![0, 1, 2];
+        byte_pair_merge(&mut symbols, rank_of);
+        assert_eq!(symbols, vec![0, 4]);
+    }
+
+    #[test]
+    fn test_merges_repeatedly() {
+        let mut symbols = vec![0, 1, 0, 1, 2];
+        byte_pair_merge(&mut symbols, rank_of);
+        assert_eq!(symbols, vec![3, 0, 4]);
+    }
+}
@@ -1,32 +1,41 @@
 //! Core BPE Tokenizer Editor struct and basic methods
 
 use anyhow::{bail, Context, Result};
-use std::collections::{HashMap, HashSet};
-use std::fs;
+use memmap2::MmapOptions;
+use rustc_hash::{FxHashMap, FxHashSet};
+use std::fs::File;
+use std::io::{BufWriter, Write};
 use std::path::PathBuf;
 
-use crate::tokenizer::Tokenizer;
+use crate::cache;
+use crate::tokenizer::{Merge, Tokenizer};
+
+use super::merge_map::MergeMap;
 
 /// BPE Tokenizer Editor with consistency guarantees
 pub struct BPETokenizerEditor {
     pub tokenizer: Tokenizer,
     // Indices for fast lookup
-    pub(crate) producer: HashMap<String, usize>, // token -> merge index that produces it
-    pub(crate) uses: HashMap<String, HashSet<usize>>, // token -> merge indices where used as input
-    pub(crate) used_ids: HashSet<u32>,
+    pub(crate) producer: FxHashMap<String, usize>, // token -> merge index that produces it
+    pub(crate) uses: FxHashMap<String, Vec<usize>>, // token -> merge indices where used as input
+    pub(crate) merge_ids: MergeMap,                // (left id, right id) -> merge index
+    pub(crate) unindexed_merges: usize, // merges whose inputs were missing from vocab when indexed
+    pub(crate) used_ids: FxHashSet<u32>,
     pub(crate) next_id: u32,
 }
 
 impl BPETokenizerEditor {
     /// Create a new editor from a Tokenizer
     pub fn new(tokenizer: Tokenizer) -> Self {
-        let used_ids: HashSet<u32> = tokenizer.model.vocab.values().copied().collect();
+        let used_ids: FxHashSet<u32> = tokenizer.model.vocab.values().copied().collect();
         let next_id = used_ids.iter().max().copied().unwrap_or(0) + 1;
 
         let mut editor = Self {
             tokenizer,
-            producer: HashMap::new(),
-            uses: HashMap::new(),
+            producer: FxHashMap::default(),
+            uses: FxHashMap::default(),
+            merge_ids: MergeMap::default(),
+            unindexed_merges: 0,
             used_ids,
             next_id,
         };
@@ -36,10 +45,20 @@ impl BPETokenizerEditor {
 
     /// Load a tokenizer from a JSON file
     pub fn load(path: &PathBuf) -> Result<Self> {
-        let content =
-            fs::read_to_string(path).with_context(|| format!("Failed to read: {:?}", path))?;
+        let file = File::open(path).with_context(|| format!("Failed to read: {:?}", path))?;
+        // SAFETY: the mapping is read-only and only lives for the duration of the parse.
+        // Concurrent truncation of the file by another process is not guarded against,
+        // the same caveat as any other mmap-based reader.
+        //
+        // `populate` prefaults the whole file in one pass (MAP_POPULATE on Linux) so a
+        // cold load is not serialized on per-page faults during parsing.
+        let content = unsafe { MmapOptions::new().populate().map(&file) }
+            .with_context(|| format!("Failed to read: {:?}", path))?;
+        // Readahead hint for platforms where `populate` is a no-op; purely advisory
+        #[cfg(unix)]
+        let _ = content.advise(memmap2::Advice::Sequential);
         let tokenizer: Tokenizer =
-            serde_json::from_str(&content).with_context(|| "Failed to parse tokenizer.json")?;
+            serde_json::from_slice(&content).with_context(|| "Failed to parse tokenizer.json")?;
 
         if tokenizer.model.model_type != "BPE" {
             bail!("Only BPE tokenizers are supported");
@@ -48,38 +67,104 @@ impl BPETokenizerEditor {
         Ok(Self::new(tokenizer))
     }
 
-    /// Save the tokenizer to a JSON file (vocab sorted by ID ascending)
-    pub fn save(&self, path: &PathBuf) -> Result<()> {
-        let mut vocab_vec: Vec<(&String, &u32)> = self.tokenizer.model.vocab.iter().collect();
-        vocab_vec.sort_by_key(|(_, id)| *id);
-
-        let vocab_ordered: serde_json::Map<String, serde_json::Value> = vocab_vec
-            .into_iter()
-            .map(|(k, v)| (k.clone(), serde_json::Value::Number((*v).into())))
-            .collect();
+    /// Load a tokenizer, going through the `.bpecache` sidecar next to it
+    ///
+    /// An up-to-date cache is used instead of parsing the JSON; otherwise the JSON is
+    /// parsed and the cache (re)written. Failing to write the cache is not an error.
+    pub fn load_cached(path: &PathBuf) -> Result<Self> {
+        if let Some(tokenizer) = cache::read(path) {
+            if tokenizer.model.model_type == "BPE" {
+                return Ok(Self::new(tokenizer));
+            }
+        }
 
-        let mut json_value = serde_json::to_value(&self.tokenizer)?;
-        json_value["model"]["vocab"] = serde_json::Value::Object(vocab_ordered);
+        // Stat before parsing so a concurrent edit leaves the cache stale, not wrong
+        let fingerprint = cache::Fingerprint::of(path);
+        let editor = Self::load(path)?;
+        if let Some(fingerprint) = fingerprint {
+            let _ = cache::write(path, fingerprint, &editor.tokenizer);
+        }
+        Ok(editor)
+    }
 
-        let content = serde_json::to_string_pretty(&json_value)
+    /// Save the tokenizer to a JSON file (vocab sorted by ID ascending)
+    pub fn save(&self, path: &PathBuf) -> Result<()> {
+        let file = File::create(path).with_context(|| format!("Failed to write: {:?}", path))?;
+        // Stream straight to disk instead of materializing the whole document first
+        let mut writer = BufWriter::with_capacity(1 << 20, file);
+        serde_json::to_writer_pretty(&mut writer, &self.tokenizer)
             .with_context(|| "Failed to serialize tokenizer")?;
-        fs::write(path, content).with_context(|| format!("Failed to write: {:?}", path))?;
+        writer
+            .flush()
+            .with_context(|| format!("Failed to write: {:?}", path))?;
         Ok(())
     }
 
+    /// Serialize the tokenizer to a pretty-printed JSON string (vocab sorted by ID ascending)
+    pub fn to_json(&self) -> Result<String> {
+        serde_json::to_string_pretty(&self.tokenizer)
+            .with_context(|| "Failed to serialize tokenizer")
+    }
+
     /// Rebuild internal indices for fast lookups
     pub fn rebuild_indices(&mut self) {
         self.producer.clear();
         self.uses.clear();
+        self.merge_ids.clear();
+        self.unindexed_merges = 0;
+
+        for i in 0..self.tokenizer.model.merges.len() {
+            self.index_merge(i);
+        }
+    }
+
+    /// Add the merge at index `i` to all lookup indices
+    fn index_merge(&mut self, i: usize) {
+        let merge = &self.tokenizer.model.merges[i];
+        self.producer.entry(merge.result()).or_insert(i);
+        // Merges are indexed in ascending order, so pushing keeps each list sorted and unique
+        add_use(&mut self.uses, &merge.0, i);
+        if merge.1 != merge.0 {
+            add_use(&mut self.uses, &merge.1, i);
+        }
 
-        for (i, merge) in self.tokenizer.model.merges.iter().enumerate() {
-            let prod = merge.result();
-            self.producer.entry(prod).or_insert(i);
-            self.uses.entry(merge.0.clone()).or_default().insert(i);
-            self.uses.entry(merge.1.clone()).or_default().insert(i);
+        let vocab = &self.tokenizer.model.vocab;
+        match (vocab.get(&merge.0), vocab.get(&merge.1)) {
+            (Some(&a), Some(&b)) => self.merge_ids.insert(a, b, i as u32),
+            _ => self.unindexed_merges += 1,
         }
     }
 
+    /// Append a merge and update the indices incrementally
+    pub(crate) fn push_merge(&mut self, a: &str, b: &str) {
+        self.tokenizer
+            .model
+            .merges
+            .push(Merge(a.to_string(), b.to_string()));
+        self.index_merge(self.tokenizer.model.merges.len() - 1);
+    }
+
+    /// Check if the merge `(a, b)` exists
+    pub fn has_merge(&self, a: &str, b: &str) -> bool {
+        let vocab = &self.tokenizer.model.vocab;
+        let merges = &self.tokenizer.model.merges;
+        let mut id_hit = false;
+        if let (Some(&ia), Some(&ib)) = (vocab.get(a), vocab.get(b)) {
+            if let Some(rank) = self.merge_ids.get(ia, ib) {
+                // Tokens sharing an ID (a broken vocab) share a key, so confirm the strings
+                let m = &merges[rank as usize];
+                if m.0 == a && m.1 == b {
+                    return true;
+                }
+                id_hit = true;
+            }
+        }
+
+        // Merges indexed before their inputs entered the vocab, or hidden behind a
+        // colliding ID pair, are only found by scanning
+        (self.unindexed_merges > 0 || id_hit) && merges.iter().any(|m| m.0 == a && m.1 == b)
+    }
+
     /// Get the current vocab size
     pub fn vocab_size(&self) -> usize {
         self.tokenizer.model.vocab.len()
@@ -109,3 +194,59 @@ impl BPETokenizerEditor {
         self.used_ids.remove(&id);
     }
 }
+
+/// Record that merge `i` uses `token` as input, cloning the key only on first use
+fn add_use(uses: &mut FxHashMap<String, Vec<usize>>, token: &str, i: usize) {
+    match uses.get_mut(token) {
+        Some(indices) => indices.push(i),
+        None => {
+            uses.insert(token.to_string(), vec![i]);
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn editor_from_json(vocab: serde_json::Value, merges: serde_json::Value) -> BPETokenizerEditor {
+        let tokenizer: Tokenizer = serde_json::from_value(serde_json::json!({
+            "version": "1.0",
+            "truncation": null,
+            "padding": null,
+            "added_tokens": [],
+            "normalizer": null,
+            "pre_tokenizer": null,
+            "post_processor": null,
+            "decoder": null,
+            "model": {
+                "type": "BPE",
+                "dropout": null,
+                "unk_token": "<unk>",
+                "continuing_subword_prefix": null,
+                "end_of_word_suffix": null,
+                "fuse_unk": false,
+                "byte_fallback": false,
+                "ignore_merges": false,
+                "vocab": vocab,
+                "merges": merges
+            }
+        }))
+        .unwrap();
+        BPETokenizerEditor::new(tokenizer)
+    }
+
+    #[test]
+    fn test_has_merge_with_shared_ids() {
+        // "a" and "d" share an ID, so (d, a) and (a, a) have the same ID pair
+        let mut editor = editor_from_json(
+            serde_json::json!({"a": 4, "d": 4, "c": 5, "aa": 6}),
+            serde_json::json!([["a", "a"]]),
+        );
+        assert!(editor.has_merge("a", "a"));
+        assert!(!editor.has_merge("d", "a"));
+
+        editor.push_merge("d", "a");
+        assert!(editor.has_merge("d", "a"));
+    }
+}
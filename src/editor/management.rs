@@ -1,10 +1,12 @@
 //! Vocab size management methods
 
-use std::collections::HashSet;
+use std::cmp::Reverse;
+use std::collections::{BinaryHeap, HashSet};
 
 use crate::types::{BatchAddResult, ShrinkResult, TokenRemovalInfo};
 
 use super::core::BPETokenizerEditor;
+use super::text::{is_single_char, is_special_token};
 
 impl BPETokenizerEditor {
     /// Build a set of protected tokens that should never be removed
@@ -13,7 +15,7 @@ impl BPETokenizerEditor {
 
         // Protect single chars
         for tok in self.tokenizer.model.vocab.keys() {
-            if tok.chars().count() == 1 {
+            if is_single_char(tok) {
                 protected.insert(tok.clone());
             }
         }
@@ -23,9 +25,7 @@ impl BPETokenizerEditor {
 
         // Protect special tokens
         for tok in self.tokenizer.model.vocab.keys() {
-            if (tok.starts_with('<') && tok.ends_with('>'))
-                || (tok.starts_with('[') && tok.ends_with(']'))
-            {
+            if is_special_token(tok) {
                 protected.insert(tok.clone());
             }
         }
@@ -64,7 +64,13 @@ impl BPETokenizerEditor {
 
     /// Find N tokens to remove: longest non-special tokens with ID >= min_id
     pub fn find_tokens_to_shrink(&self, count: usize, min_id: u32) -> Vec<(String, u32, usize)> {
-        let mut candidates: Vec<(String, u32, usize)> = vec![];
+        if count == 0 {
+            return vec![];
+        }
+
+        // Min-heap of the best `count` candidates seen so far, keyed by (length, ID)
+        let mut heap: BinaryHeap<Reverse<(usize, u32, &String)>> =
+            BinaryHeap::with_capacity(count.min(self.vocab_size()) + 1);
 
         for (tok, &id) in &self.tokenizer.model.vocab {
             if id < min_id {
@@ -76,19 +82,25 @@ impl BPETokenizerEditor {
                 continue;
             }
 
-            if (tok.starts_with('<') && tok.ends_with('>'))
-                || (tok.starts_with('[') && tok.ends_with(']'))
-            {
+            if is_special_token(tok) {
                 continue;
             }
 
-            candidates.push((tok.clone(), id, char_len));
+            if heap.len() < count {
+                heap.push(Reverse((char_len, id, tok)));
+            } else if let Some(Reverse((min_len, min_id_kept, _))) = heap.peek() {
+                if (char_len, id) > (*min_len, *min_id_kept) {
+                    heap.pop();
+                    heap.push(Reverse((char_len, id, tok)));
+                }
+            }
         }
 
-        // Sort by length DESC, then by ID DESC
-        candidates.sort_by(|a, b| b.2.cmp(&a.2).then(b.1.cmp(&a.1)));
-
-        candidates.into_iter().take(count).collect()
+        // Ascending by Reverse == length DESC, then ID DESC
+        heap.into_sorted_vec()
+            .into_iter()
+            .map(|Reverse((char_len, id, tok))| (tok.clone(), id, char_len))
+            .collect()
     }
 
     /// Remove N tokens by finding longest non-special tokens with highest IDs
@@ -107,37 +119,54 @@ impl BPETokenizerEditor {
             total_merges_removed: 0,
         };
 
-        for (token, id, len) in &tokens_to_remove {
-            if !self.has_token(token) {
-                continue;
-            }
-
-            let removal = self.remove_token_and_dependencies(token);
-
-            result.tokens_removed.push(TokenRemovalInfo {
-                token: token.clone(),
-                id: *id,
-                length: *len,
-                cascade_tokens_removed: removal.removed_tokens.len(),
-                merges_removed: removal.removed_merges.len(),
-            });
-
-            result.total_tokens_removed += removal.removed_tokens.len();
-            result.total_merges_removed += removal.removed_merges.len();
-        }
+        result.tokens_removed = self.remove_shrink_candidates(&tokens_to_remove);
+        result.total_tokens_removed = result
+            .tokens_removed
+            .iter()
+            .map(|r| r.cascade_tokens_removed)
+            .sum();
+        result.total_merges_removed = result.tokens_removed.iter().map(|r| r.merges_removed).sum();
 
         result.final_vocab_size = self.vocab_size();
         result.final_merges_count = self.merges_count();
         result
     }
 
+    /// Remove `find_tokens_to_shrink` candidates in one batch
+    ///
+    /// Candidates already taken out by an earlier cascade are skipped, exactly as when
+    /// removing them one by one, but the indices are rebuilt only once.
+    pub(crate) fn remove_shrink_candidates(
+        &mut self,
+        candidates: &[(String, u32, usize)],
+    ) -> Vec<TokenRemovalInfo> {
+        let tokens: Vec<String> = candidates.iter().map(|(tok, _, _)| tok.clone()).collect();
+        let removals = self.remove_tokens_and_dependencies(&tokens);
+
+        // Results come back in input order, so walk both lists together
+        let mut removals = removals.into_iter().peekable();
+        let mut infos = Vec::with_capacity(candidates.len());
+        for (token, id, len) in candidates {
+            if let Some(removal) = removals.next_if(|r| &r.root_token == token) {
+                infos.push(TokenRemovalInfo {
+                    token: token.clone(),
+                    id: *id,
+                    length: *len,
+                    cascade_tokens_removed: removal.removed_tokens.len(),
+                    merges_removed: removal.removed_merges.len(),
+                });
+            }
+        }
+        infos
+    }
+
     /// Get all single-letter tokens from this tokenizer
     pub fn get_single_char_tokens(&self) -> Vec<(String, u32)> {
         self.tokenizer
             .model
             .vocab
             .iter()
-            .filter(|(tok, _)| tok.chars().count() == 1)
+            .filter(|(tok, _)| is_single_char(tok))
             .map(|(tok, &id)| (tok.clone(), id))
             .collect()
     }
@@ -172,6 +201,7 @@ impl BPETokenizerEditor {
         }
 
         self.next_id = self.used_ids.len() as u32;
+        self.rebuild_indices();
     }
 
     /// Add tokens while keeping vocab size fixed
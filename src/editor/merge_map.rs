@@ -0,0 +1,34 @@
+//! Merge lookup keyed by packed token-ID pairs
+
+use rustc_hash::FxHashMap;
+
+/// Map from a merge's `(left_id, right_id)` pair to its rank in the merge list
+///
+/// Both IDs are packed into a single `u64` so a probe hashes one integer
+/// instead of two strings.
+#[derive(Debug, Default)]
+pub(crate) struct MergeMap {
+    inner: FxHashMap<u64, u32>,
+}
+
+#[inline]
+fn key(a: u32, b: u32) -> u64 {
+    ((a as u64) << 32) | b as u64
+}
+
+impl MergeMap {
+    /// Record a merge, keeping the lowest rank if the pair is already present
+    pub(crate) fn insert(&mut self, a: u32, b: u32, rank: u32) {
+        self.inner.entry(key(a, b)).or_insert(rank);
+    }
+
+    /// Get the rank of the merge `(a, b)`, if any
+    #[inline]
+    pub(crate) fn get(&self, a: u32, b: u32) -> Option<u32> {
+        self.inner.get(&key(a, b)).copied()
+    }
+
+    pub(crate) fn clear(&mut self) {
+        self.inner.clear();
+    }
+}
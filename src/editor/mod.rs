@@ -1,11 +1,15 @@
 //! BPE Tokenizer Editor modules
 
 mod addition;
+mod bpe;
 mod core;
 mod management;
+mod merge_map;
 mod reindex;
 mod removal;
+mod stats;
 mod sync;
+mod text;
 mod validation;
 
 pub use core::BPETokenizerEditor;
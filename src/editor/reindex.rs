@@ -108,6 +108,9 @@ impl BPETokenizerEditor {
         }
         self.next_id = vocab_size as u32;
 
+        // The merge map is keyed by token IDs
+        self.rebuild_indices();
+
         // New ID range
         let new_min_id = 0;
         let new_max_id = (vocab_size - 1) as u32;
@@ -1,41 +1,101 @@
 //! Token removal methods
 
-use std::collections::HashSet;
+use rustc_hash::FxHashSet;
 
 use crate::types::RemovalResult;
 
 use super::core::BPETokenizerEditor;
 
 impl BPETokenizerEditor {
+    /// Remove multiple tokens and their dependencies, skipping tokens not in vocab
+    ///
+    /// Tokens already taken out by an earlier cascade in the same batch are skipped too.
+    /// Results are the same as removing the tokens one by one, but the merge list is
+    /// filtered and the indices are rebuilt only once for the whole batch.
+    pub fn remove_tokens_and_dependencies(&mut self, tokens: &[String]) -> Vec<RemovalResult> {
+        let mut removed_tokens: FxHashSet<String> = FxHashSet::default();
+        let mut removed_merge_indices: FxHashSet<usize> = FxHashSet::default();
+        let mut results = Vec::new();
+
+        for token in tokens {
+            if !self.has_token(token) || removed_tokens.contains(token) {
+                continue;
+            }
+            let (cascade_tokens, cascade_merges) =
+                self.collect_dependencies(token, &removed_merge_indices);
+            results.push(self.removal_result(token, &cascade_tokens, &cascade_merges));
+            removed_tokens.extend(cascade_tokens);
+            removed_merge_indices.extend(cascade_merges);
+        }
+
+        self.apply_removal(&removed_tokens, &removed_merge_indices);
+        results
+    }
+
     /// Remove a token and all its dependencies (merges that use it, etc.)
     pub fn remove_token_and_dependencies(&mut self, token: &str) -> RemovalResult {
-        let mut removed_tokens: HashSet<String> = HashSet::new();
-        let mut removed_merge_indices: HashSet<usize> = HashSet::new();
+        let (tokens, merge_indices) = self.collect_dependencies(token, &FxHashSet::default());
+        let result = self.removal_result(token, &tokens, &merge_indices);
+        self.apply_removal(&tokens, &merge_indices);
+        result
+    }
+
+    /// Walk the dependency cascade of `token` without modifying anything
+    ///
+    /// Merges in `already_removed` are treated as gone, as if an earlier removal in the
+    /// same batch had been applied.
+    fn collect_dependencies(
+        &self,
+        token: &str,
+        already_removed: &FxHashSet<usize>,
+    ) -> (FxHashSet<String>, FxHashSet<usize>) {
+        let merges = &self.tokenizer.model.merges;
+        let mut removed_tokens: FxHashSet<String> = FxHashSet::default();
+        let mut removed_merge_indices: FxHashSet<usize> = FxHashSet::default();
         let mut stack = vec![token.to_string()];
 
         while let Some(t) = stack.pop() {
             if removed_tokens.contains(&t) {
                 continue;
             }
-            removed_tokens.insert(t.clone());
 
             // Find merges that use this token as input
             if let Some(indices) = self.uses.get(&t) {
                 for &mi in indices {
-                    if !removed_merge_indices.contains(&mi) {
-                        removed_merge_indices.insert(mi);
-                        let prod = self.tokenizer.model.merges[mi].result();
-                        stack.push(prod);
+                    if !already_removed.contains(&mi) && removed_merge_indices.insert(mi) {
+                        stack.push(merges[mi].result());
                     }
                 }
             }
 
-            // Find merge that produces this token
-            if let Some(&mi) = self.producer.get(&t) {
-                removed_merge_indices.insert(mi);
+            // Find merge that produces this token; if an earlier removal took the indexed
+            // producer, the next remaining one takes its place
+            match self.producer.get(&t) {
+                Some(&mi) if already_removed.contains(&mi) => {
+                    if let Some(next) = (mi + 1..merges.len())
+                        .find(|&i| !already_removed.contains(&i) && merges[i].result() == t)
+                    {
+                        removed_merge_indices.insert(next);
+                    }
+                }
+                Some(&mi) => {
+                    removed_merge_indices.insert(mi);
+                }
+                None => {}
             }
+
+            removed_tokens.insert(t);
         }
 
+        (removed_tokens, removed_merge_indices)
+    }
+
+    fn removal_result(
+        &self,
+        token: &str,
+        removed_tokens: &FxHashSet<String>,
+        removed_merge_indices: &FxHashSet<usize>,
+    ) -> RemovalResult {
         // Collect merge pairs before removing
         let removed_merges: Vec<(String, String)> = removed_merge_indices
             .iter()
@@ -45,33 +105,36 @@ impl BPETokenizerEditor {
             })
             .collect();
 
+        RemovalResult {
+            root_token: token.to_string(),
+            removed_tokens: removed_tokens.iter().cloned().collect(),
+            removed_merges,
+        }
+    }
+
+    /// Drop the given tokens and merges, then rebuild the indices once
+    fn apply_removal(
+        &mut self,
+        removed_tokens: &FxHashSet<String>,
+        removed_merge_indices: &FxHashSet<usize>,
+    ) {
         // Remove merges
         if !removed_merge_indices.is_empty() {
-            self.tokenizer.model.merges = self
-                .tokenizer
-                .model
-                .merges
-                .iter()
-                .enumerate()
-                .filter(|(i, _)| !removed_merge_indices.contains(i))
-                .map(|(_, m)| m.clone())
-                .collect();
+            let mut i = 0;
+            self.tokenizer.model.merges.retain(|_| {
+                let keep = !removed_merge_indices.contains(&i);
+                i += 1;
+                keep
+            });
         }
 
         // Remove tokens from vocab
-        for t in &removed_tokens {
-            if let Some(&id) = self.tokenizer.model.vocab.get(t) {
+        for t in removed_tokens {
+            if let Some(id) = self.tokenizer.model.vocab.remove(t) {
                 self.release_id(id);
-                self.tokenizer.model.vocab.remove(t);
             }
         }
 
         self.rebuild_indices();
-
-        RemovalResult {
-            root_token: token.to_string(),
-            removed_tokens: removed_tokens.into_iter().collect(),
-            removed_merges,
-        }
     }
 }
@@ -0,0 +1,51 @@
+//! Tokenizer statistics
+
+use crate::types::TokenizerStats;
+
+use super::core::BPETokenizerEditor;
+use super::text::is_special_token;
+
+impl BPETokenizerEditor {
+    /// Compute vocab statistics in a single pass
+    pub fn get_stats(&self) -> TokenizerStats {
+        let vocab = &self.tokenizer.model.vocab;
+
+        // Token lengths are small, so a flat histogram indexed by length beats hashing
+        let mut length_counts: Vec<usize> = Vec::with_capacity(64);
+        let mut special_token_count = 0;
+        let mut min_id = u32::MAX;
+        let mut max_id = 0u32;
+
+        for (token, &id) in vocab {
+            let char_len = token.chars().count();
+            if char_len >= length_counts.len() {
+                length_counts.resize(char_len + 1, 0);
+            }
+            length_counts[char_len] += 1;
+
+            if is_special_token(token) {
+                special_token_count += 1;
+            }
+
+            min_id = min_id.min(id);
+            max_id = max_id.max(id);
+        }
+
+        let single_char_count = length_counts.get(1).copied().unwrap_or(0);
+        let length_distribution: Vec<(usize, usize)> = length_counts
+            .into_iter()
+            .enumerate()
+            .filter(|&(_, count)| count > 0)
+            .collect();
+
+        TokenizerStats {
+            vocab_size: vocab.len(),
+            merges_count: self.merges_count(),
+            single_char_count,
+            special_token_count,
+            min_token_id: if vocab.is_empty() { 0 } else { min_id },
+            max_token_id: max_id,
+            length_distribution,
+        }
+    }
+}
@@ -2,9 +2,7 @@
 
 use std::collections::HashMap;
 
-use crate::types::{
-    CharAddInfo, ShortTokenAddInfo, SyncCharsResult, SyncShortTokensResult, TokenRemovalInfo,
-};
+use crate::types::{CharAddInfo, ShortTokenAddInfo, SyncCharsResult, SyncShortTokensResult};
 
 use super::core::BPETokenizerEditor;
 
@@ -67,49 +65,21 @@ impl BPETokenizerEditor {
             tokens_to_remove.len()
         );
         let start_time = std::time::Instant::now();
-        let mut last_print = std::time::Instant::now();
-
-        for (i, (token, id, len)) in tokens_to_remove.iter().enumerate() {
-            if !self.has_token(token) {
-                continue;
-            }
-
-            let removal = self.remove_token_and_dependencies(token);
-
-            result.tokens_removed.push(TokenRemovalInfo {
-                token: token.clone(),
-                id: *id,
-                length: *len,
-                cascade_tokens_removed: removal.removed_tokens.len(),
-                merges_removed: removal.removed_merges.len(),
-            });
 
-            result.total_tokens_removed += removal.removed_tokens.len();
-            result.total_merges_removed += removal.removed_merges.len();
+        result.tokens_removed = self.remove_shrink_candidates(&tokens_to_remove);
+        result.total_tokens_removed = result
+            .tokens_removed
+            .iter()
+            .map(|r| r.cascade_tokens_removed)
+            .sum();
+        result.total_merges_removed = result.tokens_removed.iter().map(|r| r.merges_removed).sum();
 
-            let now = std::time::Instant::now();
-            if now.duration_since(last_print).as_millis() >= 100
-                || (i + 1) == tokens_to_remove.len()
-            {
-                let elapsed = start_time.elapsed().as_secs_f64();
-                let progress = (i + 1) as f64 / tokens_to_remove.len() as f64;
-                let eta = if progress > 0.0 {
-                    elapsed / progress - elapsed
-                } else {
-                    0.0
-                };
-                eprint!(
-                    "\r   [{:5.1}%] {}/{} removed | Elapsed: {:.1}s | ETA: {:.1}s    ",
-                    progress * 100.0,
-                    i + 1,
-                    tokens_to_remove.len(),
-                    elapsed,
-                    eta
-                );
-                last_print = now;
-            }
-        }
-        eprintln!();
+        eprintln!(
+            "   Removed {} tokens ({} including cascades) in {:.1}s",
+            result.tokens_removed.len(),
+            result.total_tokens_removed,
+            start_time.elapsed().as_secs_f64()
+        );
 
         // Phase 2: Add single-char tokens
         eprintln!(
@@ -207,49 +177,21 @@ impl BPETokenizerEditor {
             tokens_to_remove.len()
         );
         let start_time = std::time::Instant::now();
-        let mut last_print = std::time::Instant::now();
-
-        for (i, (token, id, len)) in tokens_to_remove.iter().enumerate() {
-            if !self.has_token(token) {
-                continue;
-            }
-
-            let removal = self.remove_token_and_dependencies(token);
-
-            result.tokens_removed.push(TokenRemovalInfo {
-                token: token.clone(),
-                id: *id,
-                length: *len,
-                cascade_tokens_removed: removal.removed_tokens.len(),
-                merges_removed: removal.removed_merges.len(),
-            });
 
-            result.total_tokens_removed += removal.removed_tokens.len();
-            result.total_merges_removed += removal.removed_merges.len();
+        result.tokens_removed = self.remove_shrink_candidates(&tokens_to_remove);
+        result.total_tokens_removed = result
+            .tokens_removed
+            .iter()
+            .map(|r| r.cascade_tokens_removed)
+            .sum();
+        result.total_merges_removed = result.tokens_removed.iter().map(|r| r.merges_removed).sum();
 
-            let now = std::time::Instant::now();
-            if now.duration_since(last_print).as_millis() >= 100
-                || (i + 1) == tokens_to_remove.len()
-            {
-                let elapsed = start_time.elapsed().as_secs_f64();
-                let progress = (i + 1) as f64 / tokens_to_remove.len() as f64;
-                let eta = if progress > 0.0 {
-                    elapsed / progress - elapsed
-                } else {
-                    0.0
-                };
-                eprint!(
-                    "\r   [{:5.1}%] {}/{} removed | Elapsed: {:.1}s | ETA: {:.1}s    ",
-                    progress * 100.0,
-                    i + 1,
-                    tokens_to_remove.len(),
-                    elapsed,
-                    eta
-                );
-                last_print = now;
-            }
-        }
-        eprintln!();
+        eprintln!(
+            "   Removed {} tokens ({} including cascades) in {:.1}s",
+            result.tokens_removed.len(),
+            result.total_tokens_removed,
+            start_time.elapsed().as_secs_f64()
+        );
 
         // Phase 2: Add tokens and their merges
         eprintln!(
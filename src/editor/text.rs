@@ -0,0 +1,29 @@
+//! Small string predicates shared by the editor modules
+
+/// Check whether `s` is exactly one char, without scanning it
+pub(crate) fn is_single_char(s: &str) -> bool {
+    s.chars().next().is_some_and(|c| c.len_utf8() == s.len())
+}
+
+/// Check for special tokens of the form `<...>` or `[...]`
+pub(crate) fn is_special_token(token: &str) -> bool {
+    (token.starts_with('<') && token.ends_with('>'))
+        || (token.starts_with('[') && token.ends_with(']'))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_is_single_char() {
+        assert!(is_single_char("a"));
+        assert!(is_single_char("ü"));
+        assert!(is_single_char("▁"));
+        assert!(is_single_char("😀"));
+        assert!(!is_single_char(""));
+        assert!(!is_single_char("ab"));
+        assert!(!is_single_char("aü"));
+        assert!(!is_single_char("üa"));
+    }
+}
@@ -4,17 +4,22 @@ use std::collections::HashSet;
 
 use crate::tokenizer::Merge;
 
+use super::bpe::byte_pair_merge;
 use super::core::BPETokenizerEditor;
+use super::merge_map::MergeMap;
 
 impl BPETokenizerEditor {
     /// Validate all merges - check that the result of each merge exists in vocab
     pub fn validate_merges(&self) -> (Vec<usize>, Vec<(usize, Merge)>) {
         let mut valid_indices = Vec::new();
         let mut invalid = Vec::new();
+        let mut result = String::new();
 
         for (i, merge) in self.tokenizer.model.merges.iter().enumerate() {
-            let result = merge.result();
-            if self.tokenizer.model.vocab.contains_key(&result) {
+            result.clear();
+            result.push_str(&merge.0);
+            result.push_str(&merge.1);
+            if self.tokenizer.model.vocab.contains_key(result.as_str()) {
                 valid_indices.push(i);
             } else {
                 invalid.push((i, merge.clone()));
@@ -24,6 +29,125 @@ impl BPETokenizerEditor {
         (valid_indices, invalid)
     }
 
+    /// Find merges that BPE encoding can never apply
+    ///
+    /// Merge `i` of `(a, b)` only fires if encoding the word fragment it joins,
+    /// with the merges ranked before it, stops at exactly `[a, b]`. A
+    /// lower-ranked merge across the `a`/`b` boundary (or an earlier merge
+    /// producing the result directly) makes it dead. The fragment starts from
+    /// the same symbols HuggingFace's BPE builds, so `continuing_subword_prefix`
+    /// and `end_of_word_suffix` are honoured. Merges whose inputs or result are
+    /// missing from the vocab are reported by `validate_merges` instead and
+    /// skipped here, as are merges no word can ever line up.
+    pub fn find_unreachable_merges(&self) -> Vec<(usize, Merge)> {
+        let model = &self.tokenizer.model;
+        let vocab = &model.vocab;
+        let merges = &model.merges;
+        let prefix = model.continuing_subword_prefix.as_deref().unwrap_or("");
+        let suffix = model.end_of_word_suffix.as_deref().unwrap_or("");
+
+        // Rank lookup by ID pair and the ID each merge produces
+        let mut ranks = MergeMap::default();
+        let mut result_ids: Vec<Option<u32>> = Vec::with_capacity(merges.len());
+        let mut buf = String::new();
+        for (i, m) in merges.iter().enumerate() {
+            if let (Some(&a), Some(&b)) = (vocab.get(&m.0), vocab.get(&m.1)) {
+                ranks.insert(a, b, i as u32);
+            }
+            // Like HF, the right side loses its continuing-subword prefix when merged
+            let result_id = m.1.strip_prefix(prefix).and_then(|rest| {
+                buf.clear();
+                buf.push_str(&m.0);
+                buf.push_str(rest);
+                vocab.get(buf.as_str()).copied()
+            });
+            result_ids.push(result_id);
+        }
+
+        let mut unreachable = Vec::new();
+        let mut symbols: Vec<u32> = Vec::new();
+
+        for (i, merge) in merges.iter().enumerate() {
+            let (a, b) = match (vocab.get(&merge.0), vocab.get(&merge.1), result_ids[i]) {
+                (Some(&a), Some(&b), Some(_)) => (a, b),
+                _ => continue,
+            };
+
+            let all_chars_known =
+                match self.fragment_symbols(&merge.0, &merge.1, prefix, suffix, &mut symbols) {
+                    Some(known) => known,
+                    None => continue,
+                };
+
+            if all_chars_known {
+                let max_rank = i as u32;
+                byte_pair_merge(&mut symbols, |l, r| {
+                    let rank = ranks.get(l, r).filter(|&rank| rank < max_rank)?;
+                    result_ids[rank as usize].map(|merged| (rank, merged))
+                });
+            }
+
+            if !all_chars_known || symbols != [a, b] {
+                unreachable.push((i, merge.clone()));
+            }
+        }
+
+        unreachable
+    }
+
+    /// Fill `symbols` with the initial symbol IDs of the word fragment `a + b`
+    ///
+    /// Mirrors HF's `merge_word`: chars after the first of a word carry `prefix`
+    /// and the last char of a word carries `suffix`. `a` starting with `prefix`
+    /// means it sits mid-word; `b` ending with `suffix` means it ends the word.
+    /// Returns `None` if no word can put `a` and `b` side by side, otherwise
+    /// whether every symbol is in the vocab.
+    fn fragment_symbols(
+        &self,
+        a: &str,
+        b: &str,
+        prefix: &str,
+        suffix: &str,
+        symbols: &mut Vec<u32>,
+    ) -> Option<bool> {
+        let (a_core, a_initial) = match a.strip_prefix(prefix) {
+            Some(rest) if !prefix.is_empty() => (rest, false),
+            _ => (a, true),
+        };
+        // A right-hand symbol is never word-initial, and `a` cannot end the word
+        let b_core = b.strip_prefix(prefix)?;
+        if !suffix.is_empty() && a_core.ends_with(suffix) {
+            return None;
+        }
+        let (b_core, word_final) = match b_core.strip_suffix(suffix) {
+            Some(rest) if !suffix.is_empty() => (rest, true),
+            _ => (b_core, false),
+        };
+        if a_core.is_empty() || b_core.is_empty() {
+            return None;
+        }
+
+        let vocab = &self.tokenizer.model.vocab;
+        let last = a_core.chars().count() + b_core.chars().count() - 1;
+        let mut sym = String::new();
+        symbols.clear();
+        for (k, ch) in a_core.chars().chain(b_core.chars()).enumerate() {
+            sym.clear();
+            if k > 0 || !a_initial {
+                sym.push_str(prefix);
+            }
+            sym.push(ch);
+            if word_final && k == last {
+                sym.push_str(suffix);
+            }
+            match vocab.get(sym.as_str()) {
+                Some(&id) => symbols.push(id),
+                None => return Some(false),
+            }
+        }
+        Some(true)
+    }
+
     /// Remove all invalid merges from the tokenizer
     pub fn remove_invalid_merges(&mut self) -> usize {
         let (valid_indices, invalid) = self.validate_merges();
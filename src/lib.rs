@@ -2,6 +2,7 @@
 //!
 //! A tool for editing HuggingFace BPE tokenizer.json files with consistency guarantees.
 
+pub mod cache;
 pub mod cli;
 pub mod tokenizer;
 pub mod types;
@@ -215,19 +215,21 @@ fn cmd_remove(input: &PathBuf, output: &PathBuf, tokens_file: &PathBuf) -> Resul
     println!("Initial vocab size: {}", editor.vocab_size());
     println!("Removing {} tokens...", tokens.len());
 
+    // One batch call rebuilds the indices once; the results come back in input order,
+    // skipping tokens that were missing or already taken out by an earlier cascade
+    let results = editor.remove_tokens_and_dependencies(&tokens);
+    let mut results = results.iter().peekable();
+
     for token in &tokens {
-        if !editor.has_token(token) {
-            println!("  ? '{}' not found", token);
-            continue;
+        match results.next_if(|r| &r.root_token == token) {
+            Some(result) => println!(
+                "  - '{}': removed {} tokens, {} merges",
+                result.root_token,
+                result.removed_tokens.len(),
+                result.removed_merges.len()
+            ),
+            None => println!("  ? '{}' not found", token),
         }
-
-        let result = editor.remove_token_and_dependencies(token);
-        println!(
-            "  - '{}': removed {} tokens, {} merges",
-            result.root_token,
-            result.removed_tokens.len(),
-            result.removed_merges.len()
-        );
     }
 
     editor.save(output)?;
@@ -242,40 +244,27 @@ fn cmd_stats(input: &PathBuf) -> Result<()> {
     println!("Loading tokenizer from: {:?}", input);
     let editor = BPETokenizerEditor::load(input)?;
 
+    let stats = editor.get_stats();
+
     println!("\n=== Tokenizer Statistics ===");
-    println!("Vocab size: {}", editor.vocab_size());
-    println!("Merge count: {}", editor.merges_count());
+    println!("Vocab size: {}", stats.vocab_size);
+    println!("Merge count: {}", stats.merges_count);
 
     // Token length distribution
-    let mut len_dist: std::collections::HashMap<usize, usize> = std::collections::HashMap::new();
-    for tok in editor.tokenizer.model.vocab.keys() {
-        let count = tok.chars().count();
-        *len_dist.entry(count).or_default() += 1;
-    }
-
     println!("\nToken length distribution:");
-    let mut lengths: Vec<usize> = len_dist.keys().copied().collect();
-    lengths.sort();
-    for len in &lengths {
-        println!("  {} chars: {} tokens", len, len_dist[len]);
+    for (len, count) in &stats.length_distribution {
+        println!("  {} chars: {} tokens", len, count);
     }
 
     // Special tokens
-    let special_count = editor
-        .tokenizer
-        .model
-        .vocab
-        .keys()
-        .filter(|t: &&String| {
-            (t.starts_with('<') && t.ends_with('>')) || (t.starts_with('[') && t.ends_with(']'))
-        })
-        .count();
-    println!("\nSpecial tokens (<...>, [...]): {}", special_count);
+    println!(
+        "\nSpecial tokens (<...>, [...]): {}",
+        stats.special_token_count
+    );
 
     // ID range
-    let ids: Vec<u32> = editor.tokenizer.model.vocab.values().copied().collect();
-    if let (Some(&min_id), Some(&max_id)) = (ids.iter().min(), ids.iter().max()) {
-        println!("ID range: {} - {}", min_id, max_id);
+    if stats.vocab_size > 0 {
+        println!("ID range: {} - {}", stats.min_token_id, stats.max_token_id);
     }
 
     // Validation
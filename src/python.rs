@@ -2,7 +2,7 @@
 
 use pyo3::exceptions::{PyIOError, PyValueError};
 use pyo3::prelude::*;
-use pyo3::types::{PyDict, PyList};
+use pyo3::types::{PyBytes, PyDict, PyList, PyString};
 use std::collections::HashSet;
 use std::path::PathBuf;
 
@@ -25,6 +25,8 @@ pub struct PyValidationResult {
     pub invalid_count: usize,
     #[pyo3(get)]
     pub invalid_merges: Vec<(usize, String, String)>,
+    #[pyo3(get)]
+    pub boundary_invalid_merges: Vec<(usize, String, String)>,
 }
 
 /// Result of token addition
@@ -121,6 +123,8 @@ impl PyBPETokenizerEditor {
     ///
     /// Args:
     ///     path: Path to the tokenizer.json file
+    ///     use_cache: Reuse (and maintain) a binary `<path>.bpecache` sidecar for
+    ///         faster reloads; it is rebuilt whenever the JSON file changes
     ///
     /// Returns:
     ///     BPETokenizerEditor instance
@@ -129,10 +133,17 @@ impl PyBPETokenizerEditor {
     ///     IOError: If the file cannot be read
     ///     ValueError: If the tokenizer is not BPE type
     #[new]
-    #[pyo3(signature = (path))]
-    fn new(path: &str) -> PyResult<Self> {
+    #[pyo3(signature = (path, use_cache = false))]
+    fn new(py: Python<'_>, path: &str, use_cache: bool) -> PyResult<Self> {
         let path_buf = PathBuf::from(path);
-        let inner = BPETokenizerEditor::load(&path_buf)
+        let inner = py
+            .allow_threads(|| {
+                if use_cache {
+                    BPETokenizerEditor::load_cached(&path_buf)
+                } else {
+                    BPETokenizerEditor::load(&path_buf)
+                }
+            })
             .map_err(|e| PyIOError::new_err(format!("Failed to load tokenizer: {}", e)))?;
         Ok(Self { inner })
     }
@@ -140,15 +151,22 @@ impl PyBPETokenizerEditor {
     /// Create a new editor from JSON string
     ///
     /// Args:
-    ///     json_str: JSON string containing the tokenizer
+    ///     json_str: JSON containing the tokenizer, as str or UTF-8 bytes
     ///
     /// Returns:
     ///     BPETokenizerEditor instance
     #[staticmethod]
     #[pyo3(signature = (json_str))]
-    fn from_json(json_str: &str) -> PyResult<Self> {
-        let tokenizer: crate::tokenizer::Tokenizer = serde_json::from_str(json_str)
-            .map_err(|e| PyValueError::new_err(format!("Failed to parse JSON: {}", e)))?;
+    fn from_json(json_str: &Bound<'_, PyAny>) -> PyResult<Self> {
+        // bytes are parsed in place, without a round trip through a Python str
+        let parsed: serde_json::Result<crate::tokenizer::Tokenizer> =
+            if let Ok(bytes) = json_str.downcast::<PyBytes>() {
+                serde_json::from_slice(bytes.as_bytes())
+            } else {
+                serde_json::from_str(&json_str.downcast::<PyString>()?.to_cow()?)
+            };
+        let tokenizer =
+            parsed.map_err(|e| PyValueError::new_err(format!("Failed to parse JSON: {}", e)))?;
 
         if tokenizer.model.model_type != "BPE" {
             return Err(PyValueError::new_err("Only BPE tokenizers are supported"));
@@ -176,7 +194,8 @@ impl PyBPETokenizerEditor {
     /// Returns:
     ///     JSON string representation of the tokenizer
     fn to_json(&self) -> PyResult<String> {
-        serde_json::to_string_pretty(&self.inner.tokenizer)
+        self.inner
+            .to_json()
             .map_err(|e| PyValueError::new_err(format!("Failed to serialize: {}", e)))
     }
 
@@ -216,6 +235,32 @@ impl PyBPETokenizerEditor {
         self.inner.tokenizer.model.vocab.get(token).copied()
     }
 
+    /// Check which of several tokens exist in the vocabulary
+    ///
+    /// Args:
+    ///     tokens: List of token strings to check
+    ///
+    /// Returns:
+    ///     List of bools, one per input token
+    #[pyo3(signature = (tokens))]
+    fn contains_many(&self, tokens: Vec<String>) -> Vec<bool> {
+        let vocab = &self.inner.tokenizer.model.vocab;
+        tokens.iter().map(|t| vocab.contains_key(t)).collect()
+    }
+
+    /// Get the IDs of several tokens
+    ///
+    /// Args:
+    ///     tokens: List of token strings
+    ///
+    /// Returns:
+    ///     List of token IDs, None for tokens not in the vocabulary
+    #[pyo3(signature = (tokens))]
+    fn get_ids(&self, tokens: Vec<String>) -> Vec<Option<u32>> {
+        let vocab = &self.inner.tokenizer.model.vocab;
+        tokens.iter().map(|t| vocab.get(t).copied()).collect()
+    }
+
     /// Get a token by its ID
     ///
     /// Args:
@@ -238,28 +283,70 @@ impl PyBPETokenizerEditor {
     ///
     /// Returns:
     ///     Dictionary mapping token strings to their IDs
-    fn get_vocab(&self) -> PyResult<Py<PyDict>> {
-        Python::with_gil(|py| {
-            let dict = PyDict::new(py);
-            for (token, id) in &self.inner.tokenizer.model.vocab {
-                dict.set_item(token, *id)?;
-            }
-            Ok(dict.into())
-        })
+    fn get_vocab<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let dict = PyDict::new_bound(py);
+        for (token, id) in &self.inner.tokenizer.model.vocab {
+            dict.set_item(token.as_str(), *id)?;
+        }
+        Ok(dict)
     }
 
     /// Get all merges as list of tuples
     ///
     /// Returns:
     ///     List of (token_a, token_b) merge pairs
-    fn get_merges(&self) -> Vec<(String, String)> {
-        self.inner
+    fn get_merges<'py>(&self, py: Python<'py>) -> Bound<'py, PyList> {
+        let merges = &self.inner.tokenizer.model.merges;
+        PyList::new_bound(py, merges.iter().map(|m| (m.0.as_str(), m.1.as_str())))
+    }
+
+    /// Get the vocabulary as parallel columns ordered by token ID
+    ///
+    /// Cheaper than get_vocab() on large vocabularies: the IDs come back as
+    /// one contiguous buffer of native-endian u32 values instead of a Python
+    /// int per entry. View it with array.array('I', ids) or
+    /// numpy.frombuffer(ids, dtype=numpy.uint32).
+    ///
+    /// Returns:
+    ///     Tuple of (ids, tokens) where ids is bytes and tokens[i] has the
+    ///     i-th ID in ids
+    fn get_vocab_ids<'py>(
+        &self,
+        py: Python<'py>,
+    ) -> PyResult<(Bound<'py, PyBytes>, Bound<'py, PyList>)> {
+        let mut entries: Vec<(u32, &str)> = self
+            .inner
             .tokenizer
             .model
-            .merges
+            .vocab
             .iter()
-            .map(|m| (m.0.clone(), m.1.clone()))
-            .collect()
+            .map(|(token, &id)| (id, token.as_str()))
+            .collect();
+        entries.sort_unstable_by_key(|&(id, _)| id);
+
+        let width = std::mem::size_of::<u32>();
+        let ids = PyBytes::new_bound_with(py, entries.len() * width, |buf| {
+            for (chunk, &(id, _)) in buf.chunks_exact_mut(width).zip(&entries) {
+                chunk.copy_from_slice(&id.to_ne_bytes());
+            }
+            Ok(())
+        })?;
+        let tokens = PyList::new_bound(py, entries.iter().map(|&(_, token)| token));
+        Ok((ids, tokens))
+    }
+
+    /// Get all merges as two parallel lists
+    ///
+    /// Cheaper than get_merges() on large tokenizers since no per-merge
+    /// tuple is built.
+    ///
+    /// Returns:
+    ///     Tuple of (lefts, rights) where merge i is (lefts[i], rights[i])
+    fn get_merges_columns<'py>(&self, py: Python<'py>) -> (Bound<'py, PyList>, Bound<'py, PyList>) {
+        let merges = &self.inner.tokenizer.model.merges;
+        let lefts = PyList::new_bound(py, merges.iter().map(|m| m.0.as_str()));
+        let rights = PyList::new_bound(py, merges.iter().map(|m| m.1.as_str()));
+        (lefts, rights)
     }
 
     /// Get comprehensive tokenizer statistics
@@ -267,63 +354,52 @@ impl PyBPETokenizerEditor {
     /// Returns:
     ///     TokenizerStats object with detailed statistics
     fn get_stats(&self) -> PyTokenizerStats {
-        let vocab = &self.inner.tokenizer.model.vocab;
-
-        let mut length_counts: std::collections::HashMap<usize, usize> =
-            std::collections::HashMap::new();
-        let mut single_char_count = 0;
-        let mut special_token_count = 0;
-        let mut min_id = u32::MAX;
-        let mut max_id = 0u32;
-
-        for (token, &id) in vocab {
-            let char_len = token.chars().count();
-            *length_counts.entry(char_len).or_insert(0) += 1;
-
-            if char_len == 1 {
-                single_char_count += 1;
-            }
-
-            if (token.starts_with('<') && token.ends_with('>'))
-                || (token.starts_with('[') && token.ends_with(']'))
-            {
-                special_token_count += 1;
-            }
-
-            min_id = min_id.min(id);
-            max_id = max_id.max(id);
-        }
-
-        let mut length_distribution: Vec<(usize, usize)> = length_counts.into_iter().collect();
-        length_distribution.sort_by_key(|(len, _)| *len);
-
+        let stats = self.inner.get_stats();
         PyTokenizerStats {
-            vocab_size: vocab.len(),
-            merges_count: self.inner.merges_count(),
-            single_char_count,
-            special_token_count,
-            min_token_id: if vocab.is_empty() { 0 } else { min_id },
-            max_token_id: max_id,
-            length_distribution,
+            vocab_size: stats.vocab_size,
+            merges_count: stats.merges_count,
+            single_char_count: stats.single_char_count,
+            special_token_count: stats.special_token_count,
+            min_token_id: stats.min_token_id,
+            max_token_id: stats.max_token_id,
+            length_distribution: stats.length_distribution,
         }
     }
 
     /// Validate all merges - check that each merge result exists in vocabulary
     ///
+    /// Args:
+    ///     check_reachability: Also report merges that BPE encoding can never
+    ///         apply because an earlier merge across the boundary of their
+    ///         inputs fires first (boundary_invalid_merges). This re-encodes
+    ///         every merge and is several times slower than the basic check.
+    ///
     /// Returns:
     ///     ValidationResult with valid/invalid merge counts and details
-    fn validate_merges(&self) -> PyValidationResult {
+    #[pyo3(signature = (check_reachability = false))]
+    fn validate_merges(&self, check_reachability: bool) -> PyValidationResult {
         let (valid_indices, invalid) = self.inner.validate_merges();
+        let unreachable = if check_reachability {
+            self.inner.find_unreachable_merges()
+        } else {
+            Vec::new()
+        };
 
         let invalid_merges: Vec<(usize, String, String)> = invalid
             .iter()
             .map(|(idx, merge)| (*idx, merge.0.clone(), merge.1.clone()))
             .collect();
 
+        let boundary_invalid_merges: Vec<(usize, String, String)> = unreachable
+            .into_iter()
+            .map(|(idx, merge)| (idx, merge.0, merge.1))
+            .collect();
+
         PyValidationResult {
             valid_count: valid_indices.len(),
             invalid_count: invalid.len(),
             invalid_merges,
+            boundary_invalid_merges,
         }
     }
 
@@ -360,23 +436,27 @@ impl PyBPETokenizerEditor {
 
     /// Add multiple tokens
     ///
+    /// The GIL is released while the batch runs. Other Python threads keep
+    /// running, but any call on this same editor from them raises RuntimeError
+    /// (already borrowed) until the batch returns, instead of waiting.
+    ///
     /// Args:
     ///     tokens: List of token strings to add
     ///
     /// Returns:
     ///     List of AdditionResult for each token
     #[pyo3(signature = (tokens))]
-    fn add_tokens(&mut self, tokens: Vec<String>) -> Vec<PyAdditionResult> {
-        tokens
-            .iter()
-            .map(|t| {
-                let result = self.inner.add_token_with_merges(t);
-                PyAdditionResult {
-                    token: result.token,
-                    added: result.added,
-                    method: result.method,
-                    added_merges: result.added_merges,
-                }
+    fn add_tokens(&mut self, py: Python<'_>, tokens: Vec<String>) -> Vec<PyAdditionResult> {
+        let inner = &mut self.inner;
+        let results = py.allow_threads(|| inner.add_tokens_with_merges(&tokens));
+
+        results
+            .into_iter()
+            .map(|result| PyAdditionResult {
+                token: result.token,
+                added: result.added,
+                method: result.method,
+                added_merges: result.added_merges,
             })
             .collect()
     }
@@ -417,26 +497,26 @@ impl PyBPETokenizerEditor {
 
     /// Remove multiple tokens
     ///
+    /// The GIL is released while the batch runs. Other Python threads keep
+    /// running, but any call on this same editor from them raises RuntimeError
+    /// (already borrowed) until the batch returns, instead of waiting.
+    ///
     /// Args:
     ///     tokens: List of token strings to remove
     ///
     /// Returns:
     ///     List of RemovalResult for each token
     #[pyo3(signature = (tokens))]
-    fn remove_tokens(&mut self, tokens: Vec<String>) -> Vec<PyRemovalResult> {
-        tokens
-            .iter()
-            .filter_map(|t| {
-                if self.inner.has_token(t) {
-                    let result = self.inner.remove_token_and_dependencies(t);
-                    Some(PyRemovalResult {
-                        root_token: result.root_token,
-                        removed_tokens: result.removed_tokens,
-                        removed_merges: result.removed_merges,
-                    })
-                } else {
-                    None
-                }
+    fn remove_tokens(&mut self, py: Python<'_>, tokens: Vec<String>) -> Vec<PyRemovalResult> {
+        let inner = &mut self.inner;
+        let results = py.allow_threads(|| inner.remove_tokens_and_dependencies(&tokens));
+
+        results
+            .into_iter()
+            .map(|result| PyRemovalResult {
+                root_token: result.root_token,
+                removed_tokens: result.removed_tokens,
+                removed_merges: result.removed_merges,
             })
             .collect()
     }
@@ -471,6 +551,10 @@ impl PyBPETokenizerEditor {
 
     /// Find tokens that would be removed by shrink operation (preview)
     ///
+    /// The GIL is released during the scan. Other threads may read this
+    /// editor meanwhile, but a modifying call on it raises RuntimeError
+    /// (already borrowed) until the scan returns.
+    ///
     /// Args:
     ///     count: Number of tokens to find
     ///     min_id: Only consider tokens with ID >= min_id (default: 0)
@@ -478,8 +562,14 @@ impl PyBPETokenizerEditor {
     /// Returns:
     ///     List of (token, id, char_length) tuples
     #[pyo3(signature = (count, min_id = 0))]
-    fn find_tokens_to_shrink(&self, count: usize, min_id: u32) -> Vec<(String, u32, usize)> {
-        self.inner.find_tokens_to_shrink(count, min_id)
+    fn find_tokens_to_shrink(
+        &self,
+        py: Python<'_>,
+        count: usize,
+        min_id: u32,
+    ) -> Vec<(String, u32, usize)> {
+        let inner = &self.inner;
+        py.allow_threads(|| inner.find_tokens_to_shrink(count, min_id))
     }
 
     /// Get all single-character tokens
@@ -502,7 +592,12 @@ impl PyBPETokenizerEditor {
     /// Returns:
     ///     Dictionary with sync operation details
     #[pyo3(signature = (source_path, min_id = 0))]
-    fn sync_single_chars(&mut self, source_path: &str, min_id: u32) -> PyResult<Py<PyDict>> {
+    fn sync_single_chars<'py>(
+        &mut self,
+        py: Python<'py>,
+        source_path: &str,
+        min_id: u32,
+    ) -> PyResult<Bound<'py, PyDict>> {
         let source_path_buf = PathBuf::from(source_path);
         let source = BPETokenizerEditor::load(&source_path_buf)
             .map_err(|e| PyIOError::new_err(format!("Failed to load source tokenizer: {}", e)))?;
@@ -510,17 +605,15 @@ impl PyBPETokenizerEditor {
         let source_chars = source.get_single_char_tokens();
         let result = self.inner.sync_single_chars(&source_chars, min_id);
 
-        Python::with_gil(|py| {
-            let dict = PyDict::new(py);
-            dict.set_item("initial_vocab_size", result.initial_vocab_size)?;
-            dict.set_item("final_vocab_size", result.final_vocab_size)?;
-            dict.set_item("chars_in_source", result.chars_in_source)?;
-            dict.set_item("chars_already_present", result.chars_already_present)?;
-            dict.set_item("chars_added_count", result.chars_added.len())?;
-            dict.set_item("total_tokens_removed", result.total_tokens_removed)?;
-            dict.set_item("total_merges_removed", result.total_merges_removed)?;
-            Ok(dict.into())
-        })
+        let dict = PyDict::new_bound(py);
+        dict.set_item("initial_vocab_size", result.initial_vocab_size)?;
+        dict.set_item("final_vocab_size", result.final_vocab_size)?;
+        dict.set_item("chars_in_source", result.chars_in_source)?;
+        dict.set_item("chars_already_present", result.chars_already_present)?;
+        dict.set_item("chars_added_count", result.chars_added.len())?;
+        dict.set_item("total_tokens_removed", result.total_tokens_removed)?;
+        dict.set_item("total_merges_removed", result.total_merges_removed)?;
+        Ok(dict)
     }
 
     /// Add tokens while keeping vocabulary size fixed
@@ -535,11 +628,12 @@ impl PyBPETokenizerEditor {
     /// Returns:
     ///     Dictionary with operation details
     #[pyo3(signature = (tokens, whitelist = None))]
-    fn add_tokens_keep_size(
+    fn add_tokens_keep_size<'py>(
         &mut self,
+        py: Python<'py>,
         tokens: Vec<String>,
         whitelist: Option<Vec<String>>,
-    ) -> PyResult<Py<PyDict>> {
+    ) -> PyResult<Bound<'py, PyDict>> {
         let initial_size = self.inner.vocab_size();
         let extra_protected: HashSet<String> = whitelist.unwrap_or_default().into_iter().collect();
         let protected = self.inner.build_protected_set(&extra_protected);
@@ -565,15 +659,13 @@ impl PyBPETokenizerEditor {
             }
         }
 
-        Python::with_gil(|py| {
-            let dict = PyDict::new(py);
-            dict.set_item("initial_vocab_size", initial_size)?;
-            dict.set_item("final_vocab_size", self.inner.vocab_size())?;
-            dict.set_item("tokens_requested", tokens.len())?;
-            dict.set_item("tokens_added", added_count)?;
-            dict.set_item("tokens_removed", removed_count)?;
-            Ok(dict.into())
-        })
+        let dict = PyDict::new_bound(py);
+        dict.set_item("initial_vocab_size", initial_size)?;
+        dict.set_item("final_vocab_size", self.inner.vocab_size())?;
+        dict.set_item("tokens_requested", tokens.len())?;
+        dict.set_item("tokens_added", added_count)?;
+        dict.set_item("tokens_removed", removed_count)?;
+        Ok(dict)
     }
 
     /// Check if vocabulary has gaps in its ID space
@@ -29,10 +29,29 @@ pub struct Model {
     pub fuse_unk: bool,
     pub byte_fallback: bool,
     pub ignore_merges: bool,
+    #[serde(serialize_with = "serialize_vocab_by_id")]
     pub vocab: BTreeMap<String, u32>,
     pub merges: Vec<Merge>,
 }
 
+/// Serialize the vocab ordered by ID ascending, the layout HuggingFace writes
+fn serialize_vocab_by_id<S>(
+    vocab: &BTreeMap<String, u32>,
+    serializer: S,
+) -> std::result::Result<S::Ok, S::Error>
+where
+    S: serde::Serializer,
+{
+    use serde::ser::SerializeMap;
+    let mut entries: Vec<(&String, &u32)> = vocab.iter().collect();
+    entries.sort_by_key(|(_, id)| **id);
+    let mut map = serializer.serialize_map(Some(entries.len()))?;
+    for (token, id) in entries {
+        map.serialize_entry(token, id)?;
+    }
+    map.end()
+}
+
 /// A BPE merge rule (pair of tokens)
 #[derive(Debug, Clone)]
 pub struct Merge(pub String, pub String);
@@ -62,12 +81,14 @@ impl<'de> Deserialize<'de> for Merge {
     where
         D: serde::Deserializer<'de>,
     {
-        let v: Vec<String> = Vec::deserialize(deserializer)?;
+        let mut v: Vec<String> = Vec::deserialize(deserializer)?;
         if v.len() != 2 {
             return Err(serde::de::Error::custom(
                 "Merge must have exactly 2 elements",
             ));
         }
-        Ok(Merge(v[0].clone(), v[1].clone()))
+        let b = v.pop().unwrap();
+        let a = v.pop().unwrap();
+        Ok(Merge(a, b))
     }
 }
@@ -126,3 +126,16 @@ pub struct ReindexResult {
     pub ids_remapped: usize,
     pub gaps_removed: usize,
 }
+
+/// Summary statistics of a tokenizer
+#[derive(Debug, Serialize)]
+pub struct TokenizerStats {
+    pub vocab_size: usize,
+    pub merges_count: usize,
+    pub single_char_count: usize,
+    pub special_token_count: usize,
+    pub min_token_id: u32,
+    pub max_token_id: u32,
+    /// (length in chars, token count), ascending by length, zero counts omitted
+    pub length_distribution: Vec<(usize, usize)>,
+}
@@ -1,5 +1,6 @@
 """Tests for bpe_tokenizer_editor Python bindings."""
 
+import array
 import json
 import os
 import tempfile
@@ -70,12 +71,58 @@ class TestBPETokenizerEditor:
         assert editor.vocab_size == 8
         assert editor.merges_count == 2
     
+    def test_load_with_cache(self, tokenizer_file):
+        """Test that the sidecar cache is written, read, and never trusted blindly."""
+        from bpe_tokenizer_editor import BPETokenizerEditor
+        cache_path = tokenizer_file + ".bpecache"
+        try:
+            first = BPETokenizerEditor(tokenizer_file, use_cache=True)
+            assert os.path.exists(cache_path)
+            second = BPETokenizerEditor(tokenizer_file, use_cache=True)
+            assert second.to_json() == first.to_json()
+            
+            # Same size and mtime as the cached JSON: only a read of the cache
+            # can still report the old ID
+            stat = os.stat(tokenizer_file)
+            data = json.loads(json.dumps(SAMPLE_TOKENIZER))
+            data["model"]["vocab"]["abc"] = 301
+            with open(tokenizer_file, "w") as f:
+                json.dump(data, f)
+            os.utime(tokenizer_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            assert os.stat(tokenizer_file).st_size == stat.st_size
+            assert BPETokenizerEditor(tokenizer_file, use_cache=True).get_token_id("abc") == 300
+            assert BPETokenizerEditor(tokenizer_file).get_token_id("abc") == 301
+            
+            # A corrupt cache falls back to the JSON and is rewritten
+            with open(cache_path, "wb") as f:
+                f.write(b"garbage")
+            reloaded = BPETokenizerEditor(tokenizer_file, use_cache=True)
+            assert reloaded.get_token_id("abc") == 301
+            assert os.path.getsize(cache_path) > len(b"garbage")
+            
+            # Editing the JSON invalidates the cache
+            data["model"]["vocab"]["bc"] = 400
+            with open(tokenizer_file, "w") as f:
+                json.dump(data, f)
+            assert BPETokenizerEditor(tokenizer_file, use_cache=True).has_token("bc")
+        finally:
+            if os.path.exists(cache_path):
+                os.unlink(cache_path)
+    
     def test_load_from_json(self):
         """Test loading tokenizer from JSON string."""
         from bpe_tokenizer_editor import BPETokenizerEditor
         json_str = json.dumps(SAMPLE_TOKENIZER)
         editor = BPETokenizerEditor.from_json(json_str)
         assert editor.vocab_size == 8
+        
+        from_bytes = BPETokenizerEditor.from_json(json_str.encode())
+        assert from_bytes.to_json() == editor.to_json()
+        
+        with pytest.raises(ValueError):
+            BPETokenizerEditor.from_json(b"not valid json")
+        with pytest.raises(TypeError):
+            BPETokenizerEditor.from_json(123)
     
     def test_save_and_reload(self, editor):
         """Test saving and reloading tokenizer."""
@@ -88,6 +135,11 @@ class TestBPETokenizerEditor:
             reloaded = BPETokenizerEditor(temp_path)
             assert reloaded.vocab_size == editor.vocab_size
             assert reloaded.merges_count == editor.merges_count
+            assert reloaded.to_json() == editor.to_json()
+            
+            with open(temp_path) as f:
+                ids = list(json.load(f)["model"]["vocab"].values())
+            assert ids == sorted(ids)
         finally:
             os.unlink(temp_path)
     
@@ -105,6 +157,14 @@ class TestBPETokenizerEditor:
         assert editor.get_token_id("<pad>") == 0
         assert editor.get_token_id("nonexistent") is None
     
+    def test_batch_lookups(self, editor):
+        """Test contains_many and get_ids."""
+        tokens = ["a", "abc", "xyz", "<pad>"]
+        assert editor.contains_many(tokens) == [True, True, False, True]
+        assert editor.get_ids(tokens) == [100, 300, None, 0]
+        assert editor.contains_many([]) == []
+        assert editor.get_ids([]) == []
+    
     def test_get_token_by_id(self, editor):
         """Test get_token_by_id method."""
         assert editor.get_token_by_id(100) == "a"
@@ -128,6 +188,19 @@ class TestBPETokenizerEditor:
         assert ("a", "b") in merges
         assert ("ab", "c") in merges
     
+    def test_get_vocab_ids(self, editor):
+        """Test get_vocab_ids method."""
+        ids_bytes, tokens = editor.get_vocab_ids()
+        assert isinstance(ids_bytes, bytes)
+        ids = array.array("I", ids_bytes).tolist()
+        assert ids == sorted(ids)
+        assert dict(zip(tokens, ids)) == editor.get_vocab()
+    
+    def test_get_merges_columns(self, editor):
+        """Test get_merges_columns method."""
+        lefts, rights = editor.get_merges_columns()
+        assert list(zip(lefts, rights)) == editor.get_merges()
+    
     def test_get_stats(self, editor):
         """Test get_stats method."""
         stats = editor.get_stats()
@@ -135,6 +208,9 @@ class TestBPETokenizerEditor:
         assert stats.merges_count == 2
         assert stats.single_char_count == 3  # a, b, c
         assert stats.special_token_count == 3  # <pad>, <eos>, <unk>
+        assert stats.min_token_id == 0
+        assert stats.max_token_id == 300
+        assert stats.length_distribution == [(1, 3), (2, 1), (3, 1), (5, 3)]
     
     def test_validate_merges(self, editor):
         """Test validate_merges method."""
@@ -142,6 +218,54 @@ class TestBPETokenizerEditor:
         assert result.valid_count == 2
         assert result.invalid_count == 0
         assert len(result.invalid_merges) == 0
+        assert len(result.boundary_invalid_merges) == 0
+    
+    def test_validate_merges_boundary(self):
+        """Test detection of merges shadowed by an earlier boundary merge."""
+        from bpe_tokenizer_editor import BPETokenizerEditor
+        data = json.loads(json.dumps(SAMPLE_TOKENIZER))
+        data["model"]["vocab"]["bc"] = 400
+        # "abc" always encodes as a + bc, so ab + c never fires
+        data["model"]["merges"] = [["b", "c"], ["a", "b"], ["ab", "c"]]
+        editor = BPETokenizerEditor.from_json(json.dumps(data))
+        
+        result = editor.validate_merges(check_reachability=True)
+        assert result.valid_count == 3
+        assert result.invalid_count == 0
+        assert result.boundary_invalid_merges == [(2, "ab", "c")]
+        
+        # The reachability pass is opt-in
+        assert editor.validate_merges().boundary_invalid_merges == []
+    
+    def test_validate_merges_boundary_end_of_word_suffix(self):
+        """Test that word-final symbols carry end_of_word_suffix, as in HF BPE."""
+        from bpe_tokenizer_editor import BPETokenizerEditor
+        data = json.loads(json.dumps(SAMPLE_TOKENIZER))
+        data["model"]["end_of_word_suffix"] = "</w>"
+        data["model"]["vocab"] = {
+            "a": 0, "b": 1, "b</w>": 2, "ab</w>": 3, "<": 4, "/": 5, "w": 6, ">": 7,
+        }
+        data["model"]["merges"] = [["a", "b</w>"]]
+        editor = BPETokenizerEditor.from_json(json.dumps(data))
+        assert editor.validate_merges(check_reachability=True).boundary_invalid_merges == []
+        
+        # "abc" starts as a, b, c</w>: b + c</w> fires first, so ab + c</w> never does
+        data["model"]["vocab"] = {
+            "a": 0, "b": 1, "c</w>": 2, "bc</w>": 3, "ab": 4, "abc</w>": 5,
+        }
+        data["model"]["merges"] = [["b", "c</w>"], ["a", "b"], ["ab", "c</w>"]]
+        editor = BPETokenizerEditor.from_json(json.dumps(data))
+        assert editor.validate_merges(check_reachability=True).boundary_invalid_merges == [(2, "ab", "c</w>")]
+    
+    def test_validate_merges_boundary_continuing_subword_prefix(self):
+        """Test that non-initial symbols carry continuing_subword_prefix, as in HF BPE."""
+        from bpe_tokenizer_editor import BPETokenizerEditor
+        data = json.loads(json.dumps(SAMPLE_TOKENIZER))
+        data["model"]["continuing_subword_prefix"] = "##"
+        data["model"]["vocab"] = {"a": 0, "##b": 1, "##c": 2, "ab": 3, "##bc": 4, "abc": 5}
+        data["model"]["merges"] = [["a", "##b"], ["ab", "##c"], ["##b", "##c"]]
+        editor = BPETokenizerEditor.from_json(json.dumps(data))
+        assert editor.validate_merges(check_reachability=True).boundary_invalid_merges == []
     
     def test_add_token_single_char(self, editor):
         """Test adding a single character token."""
@@ -163,6 +287,14 @@ class TestBPETokenizerEditor:
         assert result.method == "longest_prefix"
         assert editor.has_token("abx")
     
+    def test_add_token_multibyte_prefix(self, editor):
+        """Test adding a token whose suffix is a multi-byte character."""
+        result = editor.add_token("aü")
+        assert result.added is True
+        assert result.method == "longest_prefix"
+        assert ("a", "ü") in result.added_merges
+        assert editor.has_token("ü")
+    
     def test_add_token_char_chain(self, editor):
         """Test adding a token via character chain."""
         result = editor.add_token("xyz")
@@ -178,6 +310,13 @@ class TestBPETokenizerEditor:
         results = editor.add_tokens(["x", "y", "z"])
         assert len(results) == 3
         assert all(r.added for r in results)
+
+        batch = [f"tok{i}" for i in range(10_000)]
+        results = editor.add_tokens(batch)
+        assert len(results) == len(batch)
+        assert all(r.added for r in results)
+        assert all(editor.has_token(t) for t in batch)
+        assert editor.validate_merges().invalid_count == 0
     
     def test_add_token_atomic(self, editor):
         """Test adding a token atomically."""
@@ -212,6 +351,15 @@ class TestBPETokenizerEditor:
         assert len(results) == 1
         assert not editor.has_token("abc")
     
+    def test_remove_tokens_overlapping_cascades(self, editor):
+        """Test that tokens removed by an earlier cascade in the batch are skipped."""
+        results = editor.remove_tokens(["ab", "abc", "c"])
+        assert [r.root_token for r in results] == ["ab", "c"]
+        assert sorted(results[0].removed_tokens) == ["ab", "abc"]
+        assert results[1].removed_tokens == ["c"]
+        assert editor.vocab_size == 5
+        assert editor.merges_count == 0
+    
     def test_find_tokens_to_shrink(self, editor):
         """Test finding tokens to shrink."""
         candidates = editor.find_tokens_to_shrink(count=2, min_id=0)
@@ -219,6 +367,9 @@ class TestBPETokenizerEditor:
         # Should find 'abc' (length 3) first, then 'ab' (length 2)
         if len(candidates) > 0:
             assert candidates[0][2] >= candidates[-1][2]  # Sorted by length desc
+        assert [c[0] for c in candidates] == ["abc", "ab"]
+        assert editor.find_tokens_to_shrink(count=0) == []
+        assert editor.find_tokens_to_shrink(count=1, min_id=250) == [("abc", 300, 3)]
     
     def test_shrink(self, editor):
         """Test shrinking vocabulary."""
@@ -242,6 +393,8 @@ class TestBPETokenizerEditor:
         data = json.loads(json_str)
         assert data["model"]["type"] == "BPE"
         assert "vocab" in data["model"]
+        ids = list(data["model"]["vocab"].values())
+        assert ids == sorted(ids)
     
     def test_repr(self, editor):
         """Test string representation."""